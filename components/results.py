@@ -1,19 +1,37 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from config import COLOR_MAP
-from utils.ml_utils import calcular_status
+from config import COLOR_MAP, PESOS_SCORE, LIMIARES_STATUS
+from utils.ml_utils import calcular_scores_vetorizado, calcular_status_vetorizado
+from utils.analise_incremental import resumo_de_scores
 
-def render_results(df_resultados, detalhes_candidatos, job_title):
+ROTULOS_COMPONENTES = {
+    "match": "Match Técnico",
+    "probabilidade": "Modelo ML",
+    "similaridade": "Similaridade",
+    "aderencia_academica": "Formação"
+}
+
+# A aderência acadêmica é o nível exigido pela vaga, igual para todos os candidatos:
+# seu peso só desloca os scores, então fica fixo e fora dos sliders da simulação
+COMPONENTES_AJUSTAVEIS = ("match", "probabilidade", "similaridade")
+
+def render_results(df_resultados, detalhes_candidatos, job_title, componentes=None, resumo=None):
     """Renderiza os resultados da análise em múltiplas abas."""
     st.success(f"✅ Análise concluída para {len(df_resultados)} candidatos para a vaga de **{job_title}**!")
+
+    if componentes is not None and len(componentes["probabilidade"]) == len(df_resultados):
+        df_simulado = render_simulacao_pesos(df_resultados, componentes)
+        if df_simulado is not df_resultados:
+            # Com pesos simulados o resumo mantido pela análise não vale mais
+            df_resultados, resumo = df_simulado, None
     
     tab_dashboard, tab_ranking, tab_individual, tab_export = st.tabs([
         "🏆 Dashboard", "📊 Ranking Geral", "👤 Análise Individual", "📤 Exportar"
     ])
     
     with tab_dashboard:
-        render_dashboard_tab(df_resultados)
+        render_dashboard_tab(df_resultados, resumo)
     
     with tab_ranking:
         render_ranking_tab(df_resultados)
@@ -24,31 +42,80 @@ def render_results(df_resultados, detalhes_candidatos, job_title):
     with tab_export:
         render_export_tab(df_resultados, detalhes_candidatos, job_title)
 
-def render_dashboard_tab(df_resultados):
-    """Renderiza a aba de Dashboard com gráfico de colunas"""
-    st.header("Dashboard da Análise")
+def _inicializar_pesos():
+    """Define os valores iniciais dos sliders da simulação uma única vez por sessão."""
+    for chave in COMPONENTES_AJUSTAVEIS:
+        st.session_state.setdefault(f"peso_{chave}", PESOS_SCORE[chave])
+    for chave, limiar in LIMIARES_STATUS.items():
+        st.session_state.setdefault(f"limiar_{chave}", limiar)
 
+def _restaurar_pesos():
+    """Volta os sliders da simulação aos pesos e limiares padrão."""
+    for chave in COMPONENTES_AJUSTAVEIS:
+        st.session_state[f"peso_{chave}"] = PESOS_SCORE[chave]
+    for chave, limiar in LIMIARES_STATUS.items():
+        st.session_state[f"limiar_{chave}"] = limiar
 
-    # Seção 1: Métrica principal
-    st.subheader("Métricas Principais")
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        score_medio = df_resultados['Score Combinado'].mean()
-        st.metric("Score Médio", f"{score_medio*100:.1f}%")
-    with col2:
-        total_candidatos = len(df_resultados)
-        st.metric("Total de Candidatos", total_candidatos)
-    with col3:
-        top_score = df_resultados['Score Combinado'].max()
-        st.metric("Melhor Score", f"{top_score*100:.1f}%")
-    
-    # Seção 3: Distribuição de Status
-    st.subheader("Distribuição de Status dos Candidatos")
-    
-    status_counts = df_resultados['Status'].value_counts().reset_index()
-    status_counts.columns = ['Status', 'Quantidade']
-    
-    # Gráfico de Barras
+def render_simulacao_pesos(df_resultados, componentes):
+    """Renderiza os sliders de pesos/limiares e reclassifica os candidatos sem reprocessar os currículos."""
+    # Os valores vêm só do session_state (sem `value=`), já que o botão de restaurar os altera
+    _inicializar_pesos()
+    with st.expander("⚖️ Simulação de Pesos e Limiares", expanded=False):
+        cols = st.columns(len(COMPONENTES_AJUSTAVEIS))
+        pesos = {}
+        for col, chave in zip(cols, COMPONENTES_AJUSTAVEIS):
+            with col:
+                pesos[chave] = st.slider(ROTULOS_COMPONENTES[chave], 0.0, 1.0, step=0.05, key=f"peso_{chave}")
+
+        cols = st.columns(2)
+        with cols[0]:
+            limiar_recomendado = st.slider(
+                "Score mínimo para Recomendado", 0.0, 1.0, step=0.01,
+                key="limiar_recomendado"
+            )
+        with cols[1]:
+            limiar_potencial = st.slider(
+                "Score mínimo para Potencial", 0.0, 1.0, step=0.01,
+                key="limiar_potencial"
+            )
+
+        limiares = {"recomendado": limiar_recomendado, "potencial": min(limiar_potencial, limiar_recomendado)}
+        padrao = all(abs(pesos[chave] - PESOS_SCORE[chave]) < 1e-9 for chave in COMPONENTES_AJUSTAVEIS) and \
+            all(abs(limiares[chave] - LIMIARES_STATUS[chave]) < 1e-9 for chave in LIMIARES_STATUS)
+
+        # Os pesos ajustáveis dividem a parcela que os padrões deixam para eles,
+        # mantendo os scores na mesma escala dos calculados na análise
+        fixos = {chave: peso for chave, peso in PESOS_SCORE.items() if chave not in COMPONENTES_AJUSTAVEIS}
+        parcela = 1 - sum(fixos.values())
+        total = sum(pesos.values())
+        if total > 0:
+            pesos = {chave: peso / total * parcela for chave, peso in pesos.items()}
+        else:
+            st.warning("Todos os pesos estão zerados; usando os pesos padrão.")
+            pesos = {chave: PESOS_SCORE[chave] for chave in COMPONENTES_AJUSTAVEIS}
+        pesos.update(fixos)
+
+        st.caption(
+            "Pesos normalizados: " +
+            " | ".join(
+                f"{ROTULOS_COMPONENTES[chave]} {pesos[chave]:.0%}" + ("" if chave in COMPONENTES_AJUSTAVEIS else " (fixo)")
+                for chave in PESOS_SCORE
+            )
+        )
+        st.button("↺ Restaurar padrão", on_click=_restaurar_pesos)
+
+    # Com os valores padrão os scores já calculados na análise são mantidos
+    if padrao:
+        return df_resultados
+
+    scores = calcular_scores_vetorizado(componentes, pesos)
+    df_ajustado = df_resultados.copy()
+    df_ajustado["Score Combinado"] = scores
+    df_ajustado["Status"] = calcular_status_vetorizado(scores, limiares)
+    return df_ajustado
+
+def _figura_status(status_counts):
+    """Gráfico de barras da distribuição de status"""
     fig = px.bar(
         status_counts,
         x='Status',
@@ -76,8 +143,45 @@ def render_dashboard_tab(df_resultados):
         yaxis=dict(showgrid=True, gridcolor='lightgray'),
         xaxis=dict(showgrid=False)
     )
+    return fig
+
+def render_dashboard_tab(df_resultados, resumo=None):
+    """Renderiza a aba de Dashboard com gráfico de colunas"""
+    st.header("Dashboard da Análise")
+
+    # Sem resumo incremental (ex.: pesos simulados) ele é calculado a partir do DataFrame
+    if resumo is None:
+        resumo = resumo_de_scores(df_resultados['Score Combinado'].to_numpy(), df_resultados['Status'])
+
+    # Seção 1: Métrica principal
+    st.subheader("Métricas Principais")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        score_medio = resumo["soma"] / resumo["total"]
+        st.metric("Score Médio", f"{score_medio*100:.1f}%")
+    with col2:
+        total_candidatos = resumo["total"]
+        st.metric("Total de Candidatos", total_candidatos)
+    with col3:
+        top_score = resumo["max"]
+        st.metric("Melhor Score", f"{top_score*100:.1f}%")
+    
+    # Seção 3: Distribuição de Status
+    st.subheader("Distribuição de Status dos Candidatos")
+    
+    status_counts = pd.DataFrame(
+        sorted(resumo["contagens"].items(), key=lambda item: -item[1]),
+        columns=['Status', 'Quantidade']
+    )
+    
+    # Gráfico de Barras: só é reconstruído quando a contagem de status muda
+    chave_fig = tuple(status_counts.itertuples(index=False, name=None))
+    fig_cache = st.session_state.get("_fig_dashboard")
+    if fig_cache is None or fig_cache[0] != chave_fig:
+        fig_cache = (chave_fig, _figura_status(status_counts))
+        st.session_state["_fig_dashboard"] = fig_cache
     
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig_cache[1], use_container_width=True)
     
     # Mostrar os dados em formato de tabela
     with st.expander("Ver dados detalhados"):
@@ -145,10 +249,12 @@ def render_individual_tab(df_resultados, detalhes_candidatos):
     """Renderiza a aba de Análise Individual"""
     st.header("Análise Detalhada por Candidato")
     
+    # Mapa ID -> Nome montado uma vez; o format_func é chamado para cada opção
+    nomes = dict(zip(df_resultados['ID'].tolist(), df_resultados['Nome'].tolist()))
     candidato_id = st.selectbox(
         "Selecione o Candidato:",
-        options=df_resultados['ID'].tolist(),
-        format_func=lambda x: f"{x} - {df_resultados[df_resultados['ID'] == x]['Nome'].iloc[0]}"
+        options=list(nomes),
+        format_func=lambda x: f"{x} - {nomes[x]}"
     )
     
     candidato = next((c for c in detalhes_candidatos if c['ID'] == candidato_id), None)
@@ -156,8 +262,9 @@ def render_individual_tab(df_resultados, detalhes_candidatos):
         st.warning("Candidato não encontrado.")
         return
     
-    score = df_resultados[df_resultados['ID'] == candidato_id]['Score Combinado'].iloc[0]
-    status, _ = calcular_status(score)
+    linha = df_resultados[df_resultados['ID'] == candidato_id].iloc[0]
+    score = linha['Score Combinado']
+    status = linha['Status']
     
     with st.container(border=True):
         st.subheader(f"📄 {candidato['Nome']}")
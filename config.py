@@ -24,8 +24,36 @@ MAPA_IDIOMA = {
     "fluente": 4
 }
 
+# Pesos padrão de cada componente no score combinado
+PESOS_SCORE = {
+    "probabilidade": 0.3,
+    "match": 0.4,
+    "similaridade": 0.2,
+    "aderencia_academica": 0.1
+}
+
+# Score mínimo para cada status (abaixo de "potencial" é Baixa Aderência)
+LIMIARES_STATUS = {
+    "recomendado": 0.6,
+    "potencial": 0.4
+}
+
 COLOR_MAP = {
     "✅ Recomendado": "green",
     "🟨 Potencial": "orange",
     "❌ Baixa Aderência": "red"
-}
\ No newline at end of file
+}
+
+# Ordem das features esperada pelo scaler e pelo modelo (ver notebook de treino)
+FEATURES_MODELO = [
+    "match_percent",
+    "similaridade_cv_vaga",
+    "qtd_termos",
+    "aderencia_academica",
+    "aderencia_ingles",
+    "aderencia_espanhol",
+    "nivel_profissional_norm"
+]
+
+# Diretório do pacote versionado de artefatos do modelo
+MODEL_BUNDLE_DIR = "model_bundle"
\ No newline at end of file
@@ -0,0 +1,418 @@
+"""Teste de carga da aplicação Streamlit com sessões simultâneas (AppTest, sem navegador).
+
+Cada sessão simulada percorre um fluxo realista: abre o app, navega pelas
+páginas da sidebar, submete o `vaga_form` com currículos PDF sintéticos, envia
+mais alguns currículos para a mesma vaga (análise incremental) e interage com
+os filtros e a simulação de pesos dos resultados. Antes dos níveis medidos, uma
+sessão de aquecimento carrega os recursos compartilhados (modelos, stopwords e
+cache de vagas). O relatório mostra latência p50/p95/p99 por interação, pico de
+RSS, vazão e hits/misses do cache de vagas para cada número de sessões
+simultâneas; sessões que falham são listadas à parte e não entram nas estatísticas.
+
+Uso:
+    python load_test.py --sessoes 1 2 4 8 --cvs 10 --rodadas 2 --json carga.json
+"""
+import argparse
+import inspect
+import json
+import random
+import resource
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+from streamlit import config as st_config
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.testing.v1 import AppTest
+
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR))
+
+from config import MAPA_ACADEMICO, MAPA_IDIOMA, MAPA_NIVEL_PROFISSIONAL
+from utils.vaga_cache import get_vaga_cache
+
+PAGINAS = ["📈 Métricas", "📖 Storytelling", "🛠️ Tecnologias", "🔍 Análise"]
+
+COMPETENCIAS = [
+    "python", "sql", "spark", "airflow", "docker", "kubernetes", "aws", "azure",
+    "java", "scala", "power bi", "excel", "git", "linux", "pandas", "machine learning",
+    "etl", "kafka", "terraform", "scrum"
+]
+
+PALAVRAS_CV = [
+    "experiência", "projetos", "desenvolvimento", "análise", "dados", "equipe",
+    "cliente", "sistemas", "implantação", "suporte", "gestão", "pipeline",
+    "relatórios", "banco", "arquitetura", "integração", "automação", "negócio"
+]
+
+SESSION_KEY_ARQUIVOS = "_load_test_arquivos"
+
+
+class ArquivoSintetico(BytesIO):
+    """Imita o `UploadedFile` do Streamlit (`name` + `getvalue`)."""
+
+    def __init__(self, nome: str, conteudo: bytes):
+        super().__init__(conteudo)
+        self.name = nome
+
+
+def gerar_pdf_sintetico(linhas: list) -> bytes:
+    """Gera um PDF mínimo de uma página com as linhas de texto informadas."""
+    def escapar(texto):
+        texto = texto.encode("latin-1", errors="replace").decode("latin-1")
+        return texto.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+    conteudo = "BT /F1 10 Tf 40 800 Td 12 TL " + " ".join(f"({escapar(l)}) '" for l in linhas) + " ET"
+    conteudo = conteudo.encode("latin-1")
+    objetos = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Length " + str(len(conteudo)).encode() + b" >>\nstream\n" + conteudo + b"\nendstream",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, obj in enumerate(objetos, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{i} 0 obj\n".encode() + obj + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{o:010d} 00000 n \n".encode() for o in offsets)
+    pdf += f"trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+def gerar_cvs(n: int, rng: random.Random) -> list:
+    """Cria `n` currículos sintéticos com competências e níveis aleatórios."""
+    cvs = []
+    for i in range(n):
+        linhas = [
+            f"Candidato {i + 1}",
+            f"Formação: {rng.choice(list(MAPA_ACADEMICO))}",
+            f"Inglês {rng.choice(list(MAPA_IDIOMA))}, espanhol {rng.choice(list(MAPA_IDIOMA))}",
+            f"Cargo: analista {rng.choice(list(MAPA_NIVEL_PROFISSIONAL))}",
+            "Competências: " + ", ".join(rng.sample(COMPETENCIAS, rng.randint(2, 10))),
+        ]
+        linhas += [" ".join(rng.choices(PALAVRAS_CV, k=12)) for _ in range(rng.randint(10, 40))]
+        cvs.append((f"cv_{i + 1:04d}.pdf", gerar_pdf_sintetico(linhas)))
+    return cvs
+
+
+def _app_load_test(raiz: str):
+    """Script executado pelo AppTest: o `main.py` com uploads vindos da sessão."""
+    import sys
+    import streamlit as st
+
+    sys.path.append(raiz)
+    # O AppTest não consegue interagir com st.file_uploader; os PDFs sintéticos
+    # de cada sessão ficam no session_state e são devolvidos no lugar do widget
+    st.file_uploader = lambda *args, **kwargs: st.session_state.get("_load_test_arquivos")
+
+    from main import main
+    main()
+
+
+def _escrever_script(diretorio: str) -> str:
+    """Grava o script do AppTest uma única vez, antes das sessões.
+
+    O `AppTest.from_function` regrava o mesmo arquivo temporário (nomeado pelo
+    hash do código) a cada chamada; uma sessão simultânea podia compilá-lo ainda
+    truncado e executar um script vazio, sem erro e com a árvore de elementos vazia.
+    """
+    caminho = Path(diretorio, "app_load_test.py")
+    fonte = textwrap.dedent(inspect.getsource(_app_load_test))
+    caminho.write_text(f"{fonte}\n_app_load_test(*__args, **__kwargs)\n", encoding="utf-8")
+    return str(caminho)
+
+
+def _preparar_runtime_concorrente():
+    """Permite vários AppTest em threads do mesmo processo.
+
+    O AppTest grava um Runtime simulado em `Runtime._instance`, apaga-o ao fim de
+    cada execução e alterna `global.appTest`; com sessões simultâneas uma execução
+    desfaria o estado de outra ainda em andamento. Aqui um Runtime simulado
+    compartilhado passa a ser usado quando nenhum estiver definido.
+    """
+    runtime_padrao = MagicMock(spec=Runtime)
+    runtime_padrao.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime_padrao.cache_storage_manager = MemoryCacheStorageManager()
+
+    def instance(cls):
+        return cls._instance if cls._instance is not None else runtime_padrao
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: True)
+    st_config.get_config_options()
+    st_config._set_option("global.appTest", True, "load_test")
+
+
+def _widget(colecao, label):
+    for widget in colecao:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"Widget não encontrado: {label!r}")
+
+
+def _verificar(at: AppTest, etapa: str, esperados: tuple = ()):
+    """Falha quando a execução terminou com erro ou sem os elementos esperados.
+
+    Toda página renderiza a navegação da sidebar, então uma árvore sem ela indica
+    uma execução que não chegou a rodar o app. `esperados` traz pares
+    `(tipo, rótulo)` de widgets que a etapa deve ter produzido.
+    """
+    if at.exception:
+        raise RuntimeError(f"{etapa}: {at.exception[0].message}")
+    if at.error:
+        raise RuntimeError(f"{etapa}: {at.error[0].value}")
+    if not any(w.label == "Selecione uma página:" for w in at.sidebar.radio):
+        raise RuntimeError(f"{etapa}: sidebar sem a navegação ({len(at.sidebar)} elementos)")
+    for tipo, label in esperados:
+        if not any(w.label == label for w in at.get(tipo)):
+            raise RuntimeError(f"{etapa}: widget {label!r} ausente")
+
+
+class MedicoesSessao:
+    """Latências de uma única sessão; só entram no nível se a sessão terminar."""
+
+    def __init__(self):
+        self.latencias = {}
+        self.etapa = None
+
+    def medir(self, nome: str, at: AppTest, acao, esperados: tuple = ()):
+        self.etapa = nome
+        inicio = time.perf_counter()
+        acao()
+        duracao = time.perf_counter() - inicio
+        _verificar(at, nome, esperados)
+        self.latencias.setdefault(nome, []).append(duracao)
+
+
+class Coletor:
+    """Acumula as latências das sessões concluídas, as falhas e o pico de RSS de forma thread-safe."""
+
+    def __init__(self):
+        self.latencias = {}
+        self.sessoes_ok = 0
+        self.falhas = []
+        self.pico_rss = _rss_atual()
+        self._lock = threading.Lock()
+
+    def registrar_sessao(self, medicoes: MedicoesSessao):
+        with self._lock:
+            self.sessoes_ok += 1
+            for nome, valores in medicoes.latencias.items():
+                self.latencias.setdefault(nome, []).extend(valores)
+
+    def registrar_falha(self, seed: int, medicoes: MedicoesSessao, erro: Exception):
+        with self._lock:
+            self.falhas.append({
+                "seed": seed,
+                "etapa": medicoes.etapa,
+                "interacoes_concluidas": sum(len(v) for v in medicoes.latencias.values()),
+                "erro": f"{type(erro).__name__}: {erro}",
+            })
+
+    def amostrar_rss(self):
+        rss = _rss_atual()
+        with self._lock:
+            self.pico_rss = max(self.pico_rss, rss)
+
+
+def _rss_atual() -> int:
+    """RSS atual do processo em bytes (pico do processo quando /proc não existe)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        fator = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * fator
+
+
+RESULTADOS = (("multiselect", "Filtrar por Status:"), ("selectbox", "Selecione o Candidato:"))
+
+
+def executar_sessao(coletor: Coletor, medicoes: MedicoesSessao, script: str, cvs: list, rodadas: int, seed: int,
+                    timeout: float):
+    """Fluxo completo de um recrutador: navegação, submissão e exploração dos resultados."""
+    rng = random.Random(seed)
+    at = AppTest(script, default_timeout=timeout, args=(str(BASE_DIR),))
+    # Parte dos CVs só chega depois, para medir a submissão incremental
+    n_iniciais = max(1, len(cvs) - max(1, len(cvs) // 5))
+    medicoes.medir("abrir_app", at, at.run)
+
+    for _ in range(rodadas):
+        for pagina in PAGINAS:
+            medicoes.medir("navegar", at, _widget(at.sidebar.radio, "Selecione uma página:").set_value(pagina).run)
+
+        _widget(at.text_input, "Título da Vaga*").input("Engenheiro de Dados")
+        _widget(at.text_area, "Competências Requeridas*").input(", ".join(rng.sample(COMPETENCIAS, 6)))
+        _widget(at.selectbox, "Nível Acadêmico*").select(rng.choice(list(MAPA_ACADEMICO)))
+        _widget(at.selectbox, "Inglês*").select(rng.choice(list(MAPA_IDIOMA)))
+        _widget(at.selectbox, "Nível Profissional*").select(rng.choice(list(MAPA_NIVEL_PROFISSIONAL)))
+        at.session_state[SESSION_KEY_ARQUIVOS] = [ArquivoSintetico(nome, dados) for nome, dados in cvs[:n_iniciais]]
+        medicoes.medir("submeter_vaga", at, _widget(at.button, "🚀 Analisar Candidatos").click().run, RESULTADOS)
+        if n_iniciais < len(cvs):
+            at.session_state[SESSION_KEY_ARQUIVOS] = [ArquivoSintetico(nome, dados) for nome, dados in cvs]
+            medicoes.medir("submeter_incremental", at, _widget(at.button, "🚀 Analisar Candidatos").click().run,
+                           RESULTADOS)
+        coletor.amostrar_rss()
+
+        # As abas de resultado são alternadas no navegador; no servidor cada
+        # interação abaixo reexecuta o script com todas as abas
+        filtro = _widget(at.multiselect, "Filtrar por Status:")
+        if filtro.value:
+            medicoes.medir("filtrar_status", at, filtro.set_value(filtro.value[:1]).run, RESULTADOS)
+        medicoes.medir("top_10", at, _widget(at.checkbox, "Mostrar apenas Top 10").check().run, RESULTADOS)
+        candidato = _widget(at.selectbox, "Selecione o Candidato:")
+        # As opções vêm formatadas ("ID - Nome"); o valor do widget é o ID
+        candidato_id = int(rng.choice(candidato.options).split(" - ", 1)[0])
+        medicoes.medir("selecionar_candidato", at, candidato.set_value(candidato_id).run, RESULTADOS)
+        medicoes.medir("simular_pesos", at, at.slider(key="peso_match").set_value(rng.choice([0.2, 0.6, 0.8])).run,
+                       RESULTADOS)
+        coletor.amostrar_rss()
+
+
+def percentis(valores: list) -> dict:
+    arr = np.asarray(valores) * 1000
+    return {
+        "n": int(arr.size),
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p95_ms": float(np.percentile(arr, 95)),
+        "p99_ms": float(np.percentile(arr, 99)),
+    }
+
+
+def seeds_sessoes(seed: int, n_sessoes: int) -> list:
+    """Seeds das sessões derivadas de `--seed` (a i-ésima sessão repete o fluxo em todos os níveis)."""
+    rng = random.Random(seed)
+    return [rng.getrandbits(32) for _ in range(n_sessoes)]
+
+
+def aquecer(script: str, cvs: list, timeout: float) -> float:
+    """Sessão completa e não medida antes dos níveis.
+
+    Carrega os recursos compartilhados por processo (`load_models`, `setup_nltk`
+    e `get_vaga_cache`) e os imports das páginas, que de outro modo seriam pagos
+    pelas primeiras sessões simultâneas e distorceriam as latências.
+    """
+    inicio = time.perf_counter()
+    executar_sessao(Coletor(), MedicoesSessao(), script, cvs, 1, 0, timeout)
+    return time.perf_counter() - inicio
+
+
+def executar_nivel(n_sessoes: int, script: str, cvs: list, rodadas: int, seed: int, timeout: float) -> dict:
+    """Executa `n_sessoes` sessões simultâneas e agrega as métricas do nível."""
+    coletor = Coletor()
+    # O cache de vagas é compartilhado pelo processo; o nível reporta só a sua parte
+    cache_antes = get_vaga_cache().stats()
+    parar = threading.Event()
+
+    def amostrador():
+        while not parar.wait(0.05):
+            coletor.amostrar_rss()
+
+    def sessao(seed_sessao):
+        medicoes = MedicoesSessao()
+        try:
+            executar_sessao(coletor, medicoes, script, cvs, rodadas, seed_sessao, timeout)
+        except Exception as e:
+            coletor.registrar_falha(seed_sessao, medicoes, e)
+        else:
+            coletor.registrar_sessao(medicoes)
+
+    thread_rss = threading.Thread(target=amostrador, daemon=True)
+    thread_rss.start()
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=n_sessoes) as executor:
+        list(executor.map(sessao, seeds_sessoes(seed, n_sessoes)))
+    duracao = time.perf_counter() - inicio
+    parar.set()
+    thread_rss.join()
+    cache_depois = get_vaga_cache().stats()
+
+    total = sum(len(v) for v in coletor.latencias.values())
+    return {
+        "sessoes": n_sessoes,
+        "sessoes_ok": coletor.sessoes_ok,
+        "duracao_s": duracao,
+        "interacoes": total,
+        "vazao_interacoes_s": total / duracao if duracao else 0.0,
+        "pico_rss_mb": coletor.pico_rss / 2**20,
+        "falhas": coletor.falhas,
+        "latencias": {nome: percentis(v) for nome, v in coletor.latencias.items()},
+        "cache_vagas": {
+            "hits": cache_depois["hits"] - cache_antes["hits"],
+            "misses": cache_depois["misses"] - cache_antes["misses"],
+            "tamanho": cache_depois["tamanho"],
+            "maxsize": cache_depois["maxsize"],
+        },
+    }
+
+
+def imprimir_relatorio(niveis: list):
+    for nivel in niveis:
+        print(
+            f"\n=== {nivel['sessoes']} sessão(ões), {nivel['sessoes_ok']} concluída(s): "
+            f"{nivel['interacoes']} interações em {nivel['duracao_s']:.1f}s | "
+            f"vazão {nivel['vazao_interacoes_s']:.2f}/s | pico RSS {nivel['pico_rss_mb']:.0f} MB"
+        )
+        cache = nivel["cache_vagas"]
+        print(
+            f"cache de vagas: {cache['hits']} hits, {cache['misses']} misses | "
+            f"{cache['tamanho']}/{cache['maxsize']} vagas em cache"
+        )
+        print(f"{'interação':<22}{'n':>6}{'p50 (ms)':>12}{'p95 (ms)':>12}{'p99 (ms)':>12}")
+        for nome, p in nivel["latencias"].items():
+            print(f"{nome:<22}{p['n']:>6}{p['p50_ms']:>12.1f}{p['p95_ms']:>12.1f}{p['p99_ms']:>12.1f}")
+        if nivel["falhas"]:
+            print(f"--- {len(nivel['falhas'])} sessão(ões) com falha (fora das estatísticas acima)")
+            for falha in nivel["falhas"]:
+                print(
+                    f"  ! seed {falha['seed']} em {falha['etapa']} "
+                    f"(após {falha['interacoes_concluidas']} interações): {falha['erro']}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Teste de carga com sessões Streamlit simultâneas")
+    parser.add_argument("--sessoes", type=int, nargs="+", default=[1, 2, 4, 8],
+                        help="Números de sessões simultâneas a testar")
+    parser.add_argument("--cvs", type=int, default=10, help="Currículos sintéticos por submissão")
+    parser.add_argument("--rodadas", type=int, default=1, help="Repetições do fluxo por sessão")
+    parser.add_argument("--timeout", type=float, default=120, help="Timeout de cada execução do script (s)")
+    parser.add_argument("--seed", type=int, default=42, help="Seed dos currículos e das sessões")
+    parser.add_argument("--json", help="Arquivo para salvar o relatório em JSON")
+    args = parser.parse_args()
+
+    _preparar_runtime_concorrente()
+    cvs = gerar_cvs(args.cvs, random.Random(args.seed))
+    with tempfile.TemporaryDirectory() as diretorio:
+        script = _escrever_script(diretorio)
+        try:
+            print(f"Aquecimento concluído em {aquecer(script, cvs, args.timeout):.1f}s")
+        except Exception as e:
+            sys.exit(f"Falha no aquecimento: {type(e).__name__}: {e}")
+        niveis = [executar_nivel(n, script, cvs, args.rodadas, args.seed, args.timeout) for n in args.sessoes]
+    imprimir_relatorio(niveis)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(niveis, f, indent=2, ensure_ascii=False)
+    if any(nivel["falhas"] for nivel in niveis):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
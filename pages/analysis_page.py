@@ -5,22 +5,24 @@ from io import BytesIO
 from config import (
     MAPA_NIVEL_PROFISSIONAL,
     MAPA_ACADEMICO,
-    MAPA_IDIOMA
+    MAPA_IDIOMA,
+    FEATURES_MODELO,
+    PESOS_SCORE
 )
 from utils.file_utils import extract_text_from_pdf, load_models
-from utils.text_processing import (
-    preprocessar_texto,
-    extrair_competencias,
-    mapear_nivel,
-    calcular_similaridade_texto,
-    setup_nltk
-)
+from utils.text_processing import preprocessar_texto, setup_nltk
+from utils.vaga_cache import get_vaga_cache, calcular_similaridade_vaga
 from utils.ml_utils import calcular_status, calcular_score_combinado
+from utils.analise_incremental import planejar_atualizacao, resumo_vazio, atualizar_resumo
 from components.results import render_results
 
 def render_main_page():
     """Renderiza a página principal de análise"""
     st.header("🎯 Ferramenta de Análise de Currículos")
+
+    # Valida o pacote de modelos ao abrir a análise (página inicial); as demais
+    # páginas não dependem dele e continuam disponíveis sem o pacote
+    load_models()
     
     with st.expander("ℹ️ Como usar esta ferramenta", expanded=False):
         st.markdown("""
@@ -44,21 +46,29 @@ def render_main_page():
                 job_spanish = st.selectbox("Espanhol", options=list(MAPA_IDIOMA.keys()))
             
             uploaded_files = st.file_uploader("Currículos (PDF)*", type=["pdf"], accept_multiple_files=True)
+            incremental = st.checkbox(
+                "Análise incremental (reaproveita os candidatos já analisados para a mesma vaga)",
+                value=True
+            )
             
             submitted = st.form_submit_button("🚀 Analisar Candidatos", type="primary")
 
     if submitted:
         process_submission(job_title, job_requirements, uploaded_files, 
-                         job_academic_level, job_english, job_spanish, job_professional_level)
+                         job_academic_level, job_english, job_spanish, job_professional_level,
+                         incremental)
     elif "resultados_df" in st.session_state:
         render_results(
             st.session_state.resultados_df,
             st.session_state.detalhes_candidatos,
-            st.session_state.job_title
+            st.session_state.job_title,
+            st.session_state.get("componentes"),
+            st.session_state.get("resumo_dashboard")
         )
 
 def process_submission(job_title, job_requirements, uploaded_files, 
-                      job_academic_level, job_english, job_spanish, job_professional_level):
+                      job_academic_level, job_english, job_spanish, job_professional_level,
+                      incremental=True):
     """Processa os currículos submetidos"""
     if not all([job_title, job_requirements, uploaded_files]):
         st.error("Preencha todos os campos obrigatórios (*)")
@@ -69,76 +79,165 @@ def process_submission(job_title, job_requirements, uploaded_files,
             model, scaler, vectorizer = load_models()
             stopwords_pt = setup_nltk()
             
-            # Processamento inicial
-            termos_vaga = extrair_competencias(job_requirements)
-            req_preprocessados = preprocessar_texto(" ".join(termos_vaga), stopwords_pt)
-            
-            # Configuração de níveis
-            nivel_academico_vaga = MAPA_ACADEMICO[job_academic_level.lower()]
-            nivel_ingles_vaga = MAPA_IDIOMA[job_english.lower()]
-            nivel_profissional_vaga = MAPA_NIVEL_PROFISSIONAL[job_professional_level.lower()]
+            # Artefatos da vaga (competências, matcher, vetor TF-IDF e níveis) vêm do cache
+            vaga = get_vaga_cache().obter(
+                job_requirements, job_academic_level, job_english, job_spanish,
+                job_professional_level, vectorizer, stopwords_pt
+            )
+
+            # Só reaproveita a análise anterior se for da mesma vaga e do mesmo pacote de
+            # modelos (floresta e scaler inclusos, não apenas o TF-IDF da chave da vaga)
+            modelo_chave = model.bundle_id
+            mesma_analise = incremental and st.session_state.get("vaga_chave") == vaga.chave and \
+                st.session_state.get("modelo_chave") == modelo_chave
+            reaproveitar = mesma_analise and "resultados_df" in st.session_state
+            if reaproveitar:
+                hashes_existentes = st.session_state.candidatos_hash
+                proximo_id = st.session_state.proximo_id
+            else:
+                hashes_existentes = []
+                proximo_id = 1
+            # PDFs já lidos sem texto não são extraídos de novo
+            hashes_vazios = set(st.session_state.get("candidatos_vazios", ())) if mesma_analise else set()
+            manter, removidos, novos = planejar_atualizacao(hashes_existentes, uploaded_files, hashes_vazios)
             
             resultados = []
             detalhes_candidatos = []
+            componentes = {chave: [] for chave in PESOS_SCORE}
+            hashes_novos = []
             
-            for idx, uploaded_file in enumerate(uploaded_files):
-                cv_text_raw = extract_text_from_pdf(BytesIO(uploaded_file.getvalue()))
-                if not cv_text_raw:
+            for hash_cv, uploaded_file in novos:
+                analise = analisar_cv(uploaded_file, proximo_id, vaga, model, scaler, vectorizer, stopwords_pt)
+                if analise is None:
+                    hashes_vazios.add(hash_cv)
                     continue
-                
-                # Processamento do currículo
-                cv_preprocessado = preprocessar_texto(cv_text_raw, stopwords_pt)
-                termos_encontrados = {term for term in termos_vaga if term in cv_text_raw.lower()}
-                match_percent = len(termos_encontrados) / len(termos_vaga) if termos_vaga else 0
-                
-                # Cálculo de similaridade
-                similaridade = calcular_similaridade_texto(req_preprocessados, cv_preprocessado, vectorizer)
-                
-                # Cálculo de scores
-                features = np.array([[
-                    match_percent,
-                    similaridade,
-                    len(termos_encontrados),
-                    nivel_academico_vaga,
-                    MAPA_IDIOMA[job_english.lower()],
-                    MAPA_IDIOMA[job_spanish.lower()],
-                    nivel_profissional_vaga / 10
-                ]])
-                
-                features_scaled = scaler.transform(features)
-                probabilidade = model.predict_proba(features_scaled)[0, 1]
-                score = calcular_score_combinado(probabilidade, match_percent, similaridade, nivel_academico_vaga)
-                status, _ = calcular_status(score)
-                
-                # Armazena resultados
-                resultados.append({
-                    "ID": idx + 1,
-                    "Nome": uploaded_file.name,
-                    "Score Combinado": score,
-                    "Status": status,
-                    "Probabilidade": probabilidade,
-                    "Match": match_percent
-                })
-                
-                # Dicionário com todas as informações do candidato (incluindo as novas aderências)
-                detalhes_candidatos.append({
-                    "ID": idx + 1,
-                    "Nome": uploaded_file.name,
-                    "Probabilidade": probabilidade,
-                    "Match": match_percent,
-                    "TermosEncontrados": ", ".join(sorted(termos_encontrados)) or "Nenhum",
-                    "TermosFaltantes": ", ".join(sorted(termos_vaga - termos_encontrados)) or "Nenhum",
-                    "TextoProcessado": cv_preprocessado[:1000] + "...",
-                    "Aderência Acadêmica": nivel_academico_vaga / 10,
-                    "Aderência Inglês": MAPA_IDIOMA[job_english.lower()] / 10,
-                    "Aderência Espanhol": MAPA_IDIOMA[job_spanish.lower()] / 10
-                })
-            
-            if resultados:
-                st.session_state.resultados_df = pd.DataFrame(resultados)
-                st.session_state.detalhes_candidatos = detalhes_candidatos
-                st.session_state.job_title = job_title
-                st.rerun()
+                resultado, detalhe, componentes_cv = analise
+                resultados.append(resultado)
+                detalhes_candidatos.append(detalhe)
+                for chave, valor in componentes_cv.items():
+                    componentes[chave].append(valor)
+                hashes_novos.append(hash_cv)
+                proximo_id += 1
+
+            df_novos = pd.DataFrame(resultados)
+            if reaproveitar:
+                df_anterior = st.session_state.resultados_df
+                df_removidos = df_anterior.iloc[removidos]
+                partes = [df_anterior.iloc[manter]] + ([df_novos] if resultados else [])
+                df_resultados = pd.concat(partes, ignore_index=True)
+                detalhes = [st.session_state.detalhes_candidatos[i] for i in manter] + detalhes_candidatos
+                componentes = {
+                    chave: np.concatenate([st.session_state.componentes[chave][manter], np.asarray(valores, dtype=float)])
+                    for chave, valores in componentes.items()
+                }
+                hashes = [hashes_existentes[i] for i in manter] + hashes_novos
+                resumo = st.session_state.resumo_dashboard
+            else:
+                df_removidos = df_novos.iloc[0:0]
+                df_resultados = df_novos
+                detalhes = detalhes_candidatos
+                componentes = {chave: np.asarray(valores, dtype=float) for chave, valores in componentes.items()}
+                hashes = hashes_novos
+                resumo = resumo_vazio()
+
+            if df_resultados.empty:
+                # Os candidatos anteriores foram removidos: descarta a análise exibida,
+                # mas guarda os PDFs sem texto para a próxima submissão incremental
+                for chave in ("resultados_df", "detalhes_candidatos", "componentes", "candidatos_hash",
+                              "proximo_id", "resumo_dashboard", "job_title"):
+                    st.session_state.pop(chave, None)
+                st.session_state.candidatos_vazios = hashes_vazios
+                st.session_state.vaga_chave = vaga.chave
+                st.session_state.modelo_chave = modelo_chave
+                st.warning("Nenhum currículo pôde ser analisado.")
+                return
+
+            # Dashboard atualizado apenas com os candidatos que entraram e saíram
+            st.session_state.resumo_dashboard = atualizar_resumo(
+                resumo,
+                df_novos["Score Combinado"] if resultados else [],
+                df_novos["Status"] if resultados else [],
+                df_removidos["Score Combinado"],
+                df_removidos["Status"],
+                df_resultados["Score Combinado"].to_numpy()
+            )
+            st.session_state.resultados_df = df_resultados
+            st.session_state.detalhes_candidatos = detalhes
+            st.session_state.componentes = componentes
+            st.session_state.candidatos_hash = hashes
+            st.session_state.candidatos_vazios = hashes_vazios
+            st.session_state.proximo_id = proximo_id
+            st.session_state.vaga_chave = vaga.chave
+            st.session_state.modelo_chave = modelo_chave
+            st.session_state.job_title = job_title
+            st.rerun()
                 
         except Exception as e:
-            st.error(f"Erro no processamento: {str(e)}")
\ No newline at end of file
+            st.error(f"Erro no processamento: {str(e)}")
+
+def analisar_cv(uploaded_file, candidato_id, vaga, model, scaler, vectorizer, stopwords_pt):
+    """Analisa um currículo e retorna (resultado, detalhes, componentes do score), ou None se não houver texto"""
+    cv_text_raw = extract_text_from_pdf(BytesIO(uploaded_file.getvalue()))
+    if not cv_text_raw:
+        return None
+    
+    termos_vaga = vaga.termos
+    nivel_academico_vaga = vaga.nivel_academico
+    nivel_profissional_vaga = vaga.nivel_profissional
+
+    # Processamento do currículo
+    cv_preprocessado = preprocessar_texto(cv_text_raw, stopwords_pt)
+    termos_encontrados = vaga.encontrar_termos(cv_text_raw.lower())
+    match_percent = len(termos_encontrados) / len(termos_vaga) if termos_vaga else 0
+    
+    # Cálculo de similaridade
+    similaridade = calcular_similaridade_vaga(vaga, cv_preprocessado, vectorizer)
+    
+    # Cálculo de scores
+    valores_features = {
+        "match_percent": match_percent,
+        "similaridade_cv_vaga": similaridade,
+        "qtd_termos": len(termos_encontrados),
+        "aderencia_academica": nivel_academico_vaga,
+        "aderencia_ingles": vaga.nivel_ingles,
+        "aderencia_espanhol": vaga.nivel_espanhol,
+        "nivel_profissional_norm": nivel_profissional_vaga / 10
+    }
+    features = np.array([[valores_features[nome] for nome in FEATURES_MODELO]])
+    
+    features_scaled = scaler.transform(features)
+    probabilidade = model.predict_proba(features_scaled)[0, 1]
+    score = calcular_score_combinado(probabilidade, match_percent, similaridade, nivel_academico_vaga)
+    status, _ = calcular_status(score)
+    
+    # Componentes do score, mantidos para a simulação de pesos
+    componentes = {
+        "probabilidade": probabilidade,
+        "match": match_percent,
+        "similaridade": similaridade,
+        "aderencia_academica": nivel_academico_vaga
+    }
+
+    resultado = {
+        "ID": candidato_id,
+        "Nome": uploaded_file.name,
+        "Score Combinado": score,
+        "Status": status,
+        "Probabilidade": probabilidade,
+        "Match": match_percent
+    }
+    
+    # Dicionário com todas as informações do candidato (incluindo as novas aderências)
+    detalhe = {
+        "ID": candidato_id,
+        "Nome": uploaded_file.name,
+        "Probabilidade": probabilidade,
+        "Match": match_percent,
+        "TermosEncontrados": ", ".join(sorted(termos_encontrados)) or "Nenhum",
+        "TermosFaltantes": ", ".join(sorted(termos_vaga - termos_encontrados)) or "Nenhum",
+        "TextoProcessado": cv_preprocessado[:1000] + "...",
+        "Aderência Acadêmica": nivel_academico_vaga / 10,
+        "Aderência Inglês": vaga.nivel_ingles / 10,
+        "Aderência Espanhol": vaga.nivel_espanhol / 10
+    }
+    return resultado, detalhe, componentes
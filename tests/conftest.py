@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from config import FEATURES_MODELO
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="session")
+def artefatos():
+    """(modelo, scaler, vectorizer) para gerar pacotes: os `.pkl` do repositório e uma floresta mínima.
+
+    O `modelo_rf_final.pkl` não está no repositório; uma floresta pequena com as
+    features certas basta para exercitar o pacote.
+    """
+    scaler = joblib.load(BASE_DIR / "scaler_final.pkl")
+    vectorizer = joblib.load(BASE_DIR / "tfidf_vectorizer.pkl")
+    X = pd.DataFrame(np.random.default_rng(0).random((20, len(FEATURES_MODELO))), columns=FEATURES_MODELO)
+    modelo = RandomForestClassifier(n_estimators=2, max_depth=2, random_state=0).fit(X, np.arange(20) % 2)
+    return modelo, scaler, vectorizer
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+import utils.model_bundle as model_bundle
+from utils.model_bundle import BundleError, build_bundle, load_bundle, read_manifest
+
+
+def _sem_temporarios(destino):
+    return [p.name for p in destino.parent.iterdir() if p.name != destino.name] == []
+
+
+def test_build_bundle_publica_pacote_conferido(artefatos, tmp_path):
+    modelo, scaler, vectorizer = artefatos
+    destino = build_bundle(modelo, scaler, vectorizer, tmp_path / "model_bundle")
+
+    b_modelo, _, _ = load_bundle(destino)
+    amostra = scaler.transform(np.random.default_rng(1).random((32, modelo.n_features_in_)))
+    np.testing.assert_allclose(b_modelo.predict_proba(amostra), modelo.predict_proba(amostra))
+    assert _sem_temporarios(destino)
+
+
+@pytest.mark.parametrize("falha", ["tfidf", "floresta"])
+def test_build_bundle_nao_substitui_pacote_quando_a_conferencia_falha(artefatos, tmp_path, monkeypatch, falha):
+    modelo, scaler, vectorizer = artefatos
+    destino = build_bundle(modelo, scaler, vectorizer, tmp_path / "model_bundle")
+    manifesto_anterior = read_manifest(destino)
+
+    if falha == "tfidf":
+        monkeypatch.setattr(model_bundle, "vetorizacao_identica", lambda compacto, original: False)
+    else:
+        monkeypatch.setattr(model_bundle.BundledForest, "predict_proba", lambda self, X: np.zeros((len(X), 2)))
+    with pytest.raises(BundleError):
+        build_bundle(modelo, scaler, vectorizer, destino)
+
+    # O pacote publicado continua o anterior e o temporário foi removido
+    assert read_manifest(destino) == manifesto_anterior
+    assert _sem_temporarios(destino)
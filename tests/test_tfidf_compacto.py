@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from utils.model_bundle import build_bundle, load_bundle
+from utils.text_processing import preprocessar_texto
+from utils.tfidf_compacto import CompactTfidfVectorizer, vetorizar_preprocessados
+
+STOPWORDS = {"de", "da", "do", "para", "com", "em", "uma", "the", "and"}
+
+
+@pytest.fixture(scope="module")
+def vectorizers(artefatos, tmp_path_factory):
+    """(original, compacto): o `tfidf_vectorizer.pkl` e o vectorizer carregado do pacote gerado num diretório temporário."""
+    modelo, scaler, original = artefatos
+    destino = build_bundle(modelo, scaler, original, tmp_path_factory.mktemp("bundle") / "model_bundle")
+    _, _, compacto = load_bundle(destino)
+    assert isinstance(compacto, CompactTfidfVectorizer)
+    return original, compacto
+
+
+@pytest.fixture(scope="module")
+def documentos(vectorizers):
+    original, _ = vectorizers
+    termos = original.get_feature_names_out()
+    rng = np.random.default_rng(42)
+    amostras = [" ".join(rng.choice(termos, size=n)) for n in (1, 5, 50, 300)]
+    nao_ascii = [t for t in termos if not t.isascii()][:20]
+    assert nao_ascii, "vocabulário sem termos não ASCII"
+    return {
+        "vocabulario": amostras,
+        "vazio": ["", "   ", "\n\t"],
+        "fora_do_vocabulario": ["xqzwv kjhgfq zzzzyyyx", "a b c ! ? 1"],
+        "maiusculas": [doc.upper() for doc in amostras[:3]] + ["Python SQL Dados PYTHON sql"],
+        "nao_ascii": [
+            " ".join(nao_ascii),
+            "Gestão de Projetos, análise de dados e integração — SÃO PAULO",
+            "naïve café résumé façade ñandú 数据 данные",
+        ],
+    }
+
+
+def _assert_matrizes_iguais(esperado, obtido):
+    assert obtido.shape == esperado.shape
+    assert obtido.dtype == esperado.dtype
+    np.testing.assert_array_equal(obtido.indptr, esperado.indptr)
+    np.testing.assert_array_equal(obtido.indices, esperado.indices)
+    np.testing.assert_array_equal(obtido.data, esperado.data)
+
+
+@pytest.mark.parametrize("caso", ["vocabulario", "vazio", "fora_do_vocabulario", "maiusculas", "nao_ascii"])
+def test_transform_texto_bruto(vectorizers, documentos, caso):
+    original, compacto = vectorizers
+    esperado = original.transform(documentos[caso])
+    _assert_matrizes_iguais(esperado, compacto.transform(documentos[caso]))
+    # Os casos com termos do vocabulário precisam de fato gerar colunas
+    assert (esperado.nnz > 0) == (caso not in ("vazio", "fora_do_vocabulario"))
+
+
+@pytest.mark.parametrize("caso", ["vocabulario", "vazio", "fora_do_vocabulario", "maiusculas", "nao_ascii"])
+def test_vetorizar_preprocessados(vectorizers, documentos, caso):
+    original, compacto = vectorizers
+    textos = [preprocessar_texto(doc, STOPWORDS) for doc in documentos[caso]]
+    _assert_matrizes_iguais(original.transform(textos), vetorizar_preprocessados(compacto, textos))
+
+
+def test_lote_misto(vectorizers, documentos):
+    """Todos os casos num único lote: linhas vazias no meio não deslocam as demais."""
+    original, compacto = vectorizers
+    lote = [doc for docs in documentos.values() for doc in docs]
+    _assert_matrizes_iguais(original.transform(lote), compacto.transform(lote))
+    textos = [preprocessar_texto(doc, STOPWORDS) for doc in lote]
+    _assert_matrizes_iguais(original.transform(textos), vetorizar_preprocessados(compacto, textos))
+
+
+def test_documento_vazio_sem_termos(vectorizers):
+    _, compacto = vectorizers
+    X = vetorizar_preprocessados(compacto, [""])
+    assert X.shape == (1, compacto.n_features)
+    assert X.nnz == 0
+
+
+def test_string_unica_rejeitada(vectorizers):
+    _, compacto = vectorizers
+    with pytest.raises(ValueError):
+        compacto.transform("um documento")
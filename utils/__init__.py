@@ -7,6 +7,7 @@ from .text_processing import (
     setup_nltk
 )
 from .ml_utils import calcular_status, calcular_score_combinado
+from .vaga_cache import get_vaga_cache, calcular_similaridade_vaga
 
 __all__ = [
     'extract_text_from_pdf',
@@ -17,5 +18,7 @@ __all__ = [
     'calcular_similaridade_texto',
     'setup_nltk',
     'calcular_status',
-    'calcular_score_combinado'
+    'calcular_score_combinado',
+    'get_vaga_cache',
+    'calcular_similaridade_vaga'
 ]
\ No newline at end of file
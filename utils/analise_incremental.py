@@ -0,0 +1,68 @@
+import hashlib
+
+import numpy as np
+
+
+def hash_conteudo(dados: bytes) -> str:
+    """Hash estável do conteúdo do arquivo, usado como chave do candidato."""
+    return hashlib.sha256(dados).hexdigest()
+
+
+def planejar_atualizacao(hashes_existentes: list, uploaded_files,
+                         hashes_vazios=frozenset()) -> tuple[list, list, list]:
+    """Compara os arquivos enviados com os candidatos já analisados.
+
+    Retorna os índices das linhas a manter, os índices das linhas removidas e a
+    lista `(hash, arquivo)` dos arquivos novos (duplicados são ignorados). Arquivos
+    em `hashes_vazios` já foram lidos sem texto e não voltam para a análise.
+    """
+    enviados = {}
+    for uploaded_file in uploaded_files:
+        enviados.setdefault(hash_conteudo(uploaded_file.getvalue()), uploaded_file)
+
+    conhecidos = set(hashes_existentes)
+    manter = [i for i, h in enumerate(hashes_existentes) if h in enviados]
+    removidos = [i for i, h in enumerate(hashes_existentes) if h not in enviados]
+    novos = [(h, f) for h, f in enviados.items() if h not in conhecidos and h not in hashes_vazios]
+    return manter, removidos, novos
+
+
+def resumo_vazio() -> dict:
+    return {"total": 0, "soma": 0.0, "max": float("-inf"), "contagens": {}}
+
+
+def atualizar_resumo(resumo: dict, scores_novos, status_novos, scores_removidos, status_removidos,
+                     scores_finais) -> dict:
+    """Aplica ao resumo do dashboard apenas a diferença entre as análises.
+
+    O máximo só é recalculado sobre `scores_finais` quando o candidato com o
+    melhor score foi removido.
+    """
+    scores_novos = np.asarray(scores_novos, dtype=float)
+    scores_removidos = np.asarray(scores_removidos, dtype=float)
+    contagens = dict(resumo["contagens"])
+    for status in status_novos:
+        contagens[status] = contagens.get(status, 0) + 1
+    for status in status_removidos:
+        contagens[status] -= 1
+        if contagens[status] == 0:
+            del contagens[status]
+
+    total = resumo["total"] + scores_novos.size - scores_removidos.size
+    maximo = resumo["max"]
+    if scores_removidos.size and scores_removidos.max() >= maximo:
+        maximo = float(np.max(scores_finais)) if total else float("-inf")
+    if scores_novos.size:
+        maximo = max(maximo, float(scores_novos.max()))
+
+    return {
+        "total": total,
+        "soma": resumo["soma"] + float(scores_novos.sum()) - float(scores_removidos.sum()),
+        "max": maximo,
+        "contagens": contagens,
+    }
+
+
+def resumo_de_scores(scores, status) -> dict:
+    """Resumo do dashboard calculado do zero (usado na simulação de pesos)."""
+    return atualizar_resumo(resumo_vazio(), scores, status, [], [], scores)
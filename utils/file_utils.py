@@ -1,8 +1,9 @@
 import PyPDF2
 from io import BytesIO
 from pathlib import Path
-import joblib
 import streamlit as st
+from config import MODEL_BUNDLE_DIR
+from utils.model_bundle import load_bundle
 
 def extract_text_from_pdf(uploaded_file: BytesIO) -> str:
     """Extrai texto de arquivos PDF com tratamento de caracteres inválidos"""
@@ -26,13 +27,14 @@ def extract_text_from_pdf(uploaded_file: BytesIO) -> str:
 
 @st.cache_resource
 def load_models():
-    """Carrega os modelos ML salvos"""
+    """Carrega os modelos ML a partir do pacote versionado de artefatos"""
     try:
         base_dir = Path(__file__).resolve().parent.parent
-        model = joblib.load(base_dir / 'modelo_rf_final.pkl')
-        scaler = joblib.load(base_dir / 'scaler_final.pkl')
-        vectorizer = joblib.load(base_dir / 'tfidf_vectorizer.pkl')
-        return model, scaler, vectorizer
+        return load_bundle(base_dir / MODEL_BUNDLE_DIR)
     except Exception as e:
         st.error(f"Erro ao carregar modelos: {str(e)}")
+        st.info(
+            "Gere o pacote de modelos com `python -m utils.model_bundle` "
+            "(veja a seção *Instalação* do README)."
+        )
         st.stop()
@@ -1,16 +1,39 @@
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.ensemble import RandomForestClassifier
+from config import PESOS_SCORE, LIMIARES_STATUS, COLOR_MAP
 
-def calcular_status(score: float) -> tuple[str, str]:
+STATUS_ORDEM = list(COLOR_MAP.keys())
+
+def calcular_status(score: float, limiares: dict = LIMIARES_STATUS) -> tuple[str, str]:
     """Calcula o status e a cor correspondente com base no score."""
-    if score >= 0.6:
+    if score >= limiares["recomendado"]:
         return "✅ Recomendado", "green"
-    elif score >= 0.4:
+    elif score >= limiares["potencial"]:
         return "🟨 Potencial", "orange"
     else:
         return "❌ Baixa Aderência", "red"
 
-def calcular_score_combinado(probabilidade: float, match_percent: float, similaridade: float, aderencia_academica: float) -> float:
+def calcular_score_combinado(probabilidade: float, match_percent: float, similaridade: float, aderencia_academica: float,
+                             pesos: dict = PESOS_SCORE) -> float:
     """Calcula o score combinado com pesos pré-definidos."""
-    return (probabilidade * 0.3) + (match_percent * 0.4) + (similaridade * 0.2) + (aderencia_academica * 0.1)
\ No newline at end of file
+    return (probabilidade * pesos["probabilidade"]) + (match_percent * pesos["match"]) + \
+        (similaridade * pesos["similaridade"]) + (aderencia_academica * pesos["aderencia_academica"])
+
+def calcular_scores_vetorizado(componentes: dict, pesos: dict = PESOS_SCORE) -> np.ndarray:
+    """Versão vetorizada de `calcular_score_combinado` sobre arrays de componentes."""
+    return calcular_score_combinado(
+        componentes["probabilidade"],
+        componentes["match"],
+        componentes["similaridade"],
+        componentes["aderencia_academica"],
+        pesos
+    )
+
+def calcular_status_vetorizado(scores: np.ndarray, limiares: dict = LIMIARES_STATUS) -> np.ndarray:
+    """Versão vetorizada de `calcular_status` (retorna apenas os rótulos)."""
+    return np.select(
+        [scores >= limiares["recomendado"], scores >= limiares["potencial"]],
+        STATUS_ORDEM[:2],
+        default=STATUS_ORDEM[2]
+    )
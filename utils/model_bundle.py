@@ -0,0 +1,429 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from config import FEATURES_MODELO, MODEL_BUNDLE_DIR
+from utils.tfidf_compacto import (
+    CompactTfidfVectorizer,
+    build_hash_index,
+    decode_vocabulary,
+    encode_vocabulary,
+    parametros_suportados
+)
+
+BUNDLE_FORMAT = "datathon-model-bundle"
+BUNDLE_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+# Arrays gravados no pacote: nome lógico -> arquivo .npy
+ARRAYS_BUNDLE = {
+    "forest_roots": "forest_roots.npy",
+    "forest_children_left": "forest_children_left.npy",
+    "forest_children_right": "forest_children_right.npy",
+    "forest_feature": "forest_feature.npy",
+    "forest_threshold": "forest_threshold.npy",
+    "forest_value": "forest_value.npy",
+    "forest_classes": "forest_classes.npy",
+    "scaler_scale": "scaler_scale.npy",
+    "scaler_min": "scaler_min.npy",
+    "tfidf_idf": "tfidf_idf.npy",
+    "tfidf_vocab_bytes": "tfidf_vocab_bytes.npy",
+    "tfidf_vocab_offsets": "tfidf_vocab_offsets.npy",
+    "tfidf_hash_sorted": "tfidf_hash_sorted.npy",
+    "tfidf_hash_cols": "tfidf_hash_cols.npy",
+}
+
+
+class BundleError(Exception):
+    """Pacote de artefatos ausente, incompleto ou incompatível com a aplicação."""
+
+
+class BundledForest:
+    """RandomForest reconstruída a partir de arrays planos (compatível com `predict_proba`)."""
+
+    def __init__(self, roots, children_left, children_right, feature, threshold, value, classes):
+        self.roots = roots
+        self.children_left = children_left
+        self.children_right = children_right
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.classes_ = classes
+        self.n_estimators = len(roots)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """Percorre todas as árvores em paralelo e faz a média das probabilidades das folhas."""
+        # O scikit-learn compara as features em float32 com limiares em float64
+        X = np.asarray(X, dtype=np.float32)
+        amostras = np.arange(X.shape[0])
+        nos = np.repeat(self.roots[:, None], X.shape[0], axis=1)
+        while True:
+            esquerda = self.children_left[nos]
+            folha = esquerda == -1
+            if folha.all():
+                break
+            vai_esquerda = X[amostras, self.feature[nos]] <= self.threshold[nos]
+            proximo = np.where(vai_esquerda, esquerda, self.children_right[nos])
+            nos = np.where(folha, nos, proximo)
+        return self.value[nos].mean(axis=0)
+
+
+class BundledScaler:
+    """MinMaxScaler reconstruído a partir de `scale_` e `min_`."""
+
+    def __init__(self, scale, min_, feature_range, clip):
+        self.scale_ = scale
+        self.min_ = min_
+        self.feature_range = tuple(feature_range)
+        self.clip = clip
+
+    def transform(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64) * self.scale_ + self.min_
+        if self.clip:
+            np.clip(X, self.feature_range[0], self.feature_range[1], out=X)
+        return X
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            digest.update(bloco)
+    return digest.hexdigest()
+
+
+def _flatten_forest(model) -> dict:
+    """Concatena os nós de todas as árvores num único conjunto de arrays."""
+    roots, left, right, feature, threshold, value = [], [], [], [], [], []
+    offset = 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        roots.append(offset)
+        for destino, filhos in ((left, tree.children_left), (right, tree.children_right)):
+            filhos = filhos.astype(np.int64)
+            destino.append(np.where(filhos == -1, -1, filhos + offset))
+        feature.append(tree.feature.astype(np.int64))
+        threshold.append(tree.threshold.astype(np.float64))
+        valores = tree.value[:, 0, :].astype(np.float64)
+        value.append(valores / valores.sum(axis=1, keepdims=True))
+        offset += tree.node_count
+    return {
+        "forest_roots": np.asarray(roots, dtype=np.int64),
+        "forest_children_left": np.concatenate(left),
+        "forest_children_right": np.concatenate(right),
+        "forest_feature": np.concatenate(feature),
+        "forest_threshold": np.concatenate(threshold),
+        "forest_value": np.concatenate(value),
+        "forest_classes": np.asarray(model.classes_),
+    }
+
+
+def _vectorizer_params(vectorizer) -> dict:
+    """Extrai os parâmetros do TfidfVectorizer que podem ser serializados em JSON."""
+    params = vectorizer.get_params()
+    params.pop("vocabulary", None)
+    if params["tokenizer"] is not None or params["preprocessor"] is not None or callable(params["analyzer"]):
+        raise BundleError("Vectorizer com tokenizer/preprocessor/analyzer customizado não é suportado")
+    params["dtype"] = np.dtype(params["dtype"]).name
+    params["ngram_range"] = list(params["ngram_range"])
+    if isinstance(params["stop_words"], (set, frozenset, tuple)):
+        params["stop_words"] = sorted(params["stop_words"])
+    return params
+
+
+def _write_bundle(model, scaler, vectorizer, destino: Path) -> Path:
+    """Grava o pacote num diretório temporário ao lado de `destino` e o retorna."""
+    import sklearn
+
+    if model.n_features_in_ != len(FEATURES_MODELO) or scaler.n_features_in_ != len(FEATURES_MODELO):
+        raise BundleError(f"Modelo e scaler devem usar {len(FEATURES_MODELO)} features")
+    # A ordem gravada no manifesto precisa ser a mesma do treino, não só a quantidade
+    for nome, objeto in (("Modelo", model), ("Scaler", scaler)):
+        nomes = getattr(objeto, "feature_names_in_", None)
+        if nomes is not None and list(nomes) != list(FEATURES_MODELO):
+            raise BundleError(
+                f"{nome} treinado com features {list(nomes)}, diferente de config.FEATURES_MODELO"
+            )
+
+    vocabulario = sorted(vectorizer.vocabulary_.items(), key=lambda item: item[1])
+    vocab_bytes, vocab_offsets = encode_vocabulary([termo for termo, _ in vocabulario])
+    hash_sorted, hash_cols = build_hash_index(vocab_bytes, vocab_offsets)
+    arrays = _flatten_forest(model)
+    arrays.update({
+        "scaler_scale": np.asarray(scaler.scale_, dtype=np.float64),
+        "scaler_min": np.asarray(scaler.min_, dtype=np.float64),
+        "tfidf_idf": np.asarray(vectorizer.idf_, dtype=np.float64),
+        "tfidf_vocab_bytes": vocab_bytes,
+        "tfidf_vocab_offsets": vocab_offsets,
+        "tfidf_hash_sorted": hash_sorted,
+        "tfidf_hash_cols": hash_cols,
+    })
+
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{destino.name}-", dir=destino.parent))
+    try:
+        manifest_arrays = {}
+        for nome, arquivo in ARRAYS_BUNDLE.items():
+            np.save(tmp_dir / arquivo, arrays[nome], allow_pickle=False)
+            manifest_arrays[nome] = {
+                "file": arquivo,
+                "sha256": _sha256(tmp_dir / arquivo),
+                "dtype": arrays[nome].dtype.str,
+                "shape": list(arrays[nome].shape),
+            }
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "format_version": BUNDLE_VERSION,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "sklearn_version": sklearn.__version__,
+            "feature_order": list(FEATURES_MODELO),
+            "scaler": {"feature_range": list(scaler.feature_range), "clip": bool(scaler.clip)},
+            "vectorizer": {"params": _vectorizer_params(vectorizer)},
+            "arrays": manifest_arrays,
+        }
+        with open(tmp_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+        os.chmod(tmp_dir, 0o755)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return tmp_dir
+
+
+def _check_equivalence(bundle_dir: Path, model, scaler, vectorizer):
+    """Carrega o pacote gravado e confere scaler, floresta e TF-IDF contra os objetos originais."""
+    b_model, b_scaler, b_vectorizer = load_bundle(bundle_dir)
+    amostra = np.random.default_rng(0).random((256, len(FEATURES_MODELO)))
+    if not np.allclose(b_scaler.transform(amostra), scaler.transform(amostra)):
+        raise BundleError("Scaler do pacote diverge do original")
+    amostra = scaler.transform(amostra)
+    if not np.allclose(b_model.predict_proba(amostra), model.predict_proba(amostra)):
+        raise BundleError("Floresta do pacote diverge do modelo original")
+    if not vetorizacao_identica(b_vectorizer, vectorizer):
+        raise BundleError("TF-IDF do pacote diverge do vectorizer original")
+
+
+def _publish_bundle(tmp_dir: Path, destino: Path):
+    """Troca o pacote publicado pelo recém-gravado de uma vez, sem expor um pacote parcial."""
+    if destino.exists():
+        antigo = destino.with_name(f".{destino.name}-old")
+        shutil.rmtree(antigo, ignore_errors=True)
+        os.replace(destino, antigo)
+        os.replace(tmp_dir, destino)
+        shutil.rmtree(antigo, ignore_errors=True)
+    else:
+        os.replace(tmp_dir, destino)
+
+
+def build_bundle(model, scaler, vectorizer, destino) -> Path:
+    """Gera o pacote versionado (arrays .npy + manifesto) a partir dos objetos treinados.
+
+    O pacote é gravado num diretório temporário ao lado de `destino`, carregado e
+    comparado com os objetos originais; só então substitui o pacote publicado.
+    Se alguma conferência falhar, o pacote anterior continua intacto.
+    """
+    destino = Path(destino)
+    tmp_dir = _write_bundle(model, scaler, vectorizer, destino)
+    try:
+        _check_equivalence(tmp_dir, model, scaler, vectorizer)
+        _publish_bundle(tmp_dir, destino)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    return destino
+
+
+def read_manifest(bundle_dir) -> dict:
+    """Lê e valida o manifesto do pacote (formato, versão e ordem das features)."""
+    caminho = Path(bundle_dir) / MANIFEST_NAME
+    if not caminho.is_file():
+        raise BundleError(f"Manifesto não encontrado em {caminho}")
+    with open(caminho, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise BundleError(f"Formato de pacote desconhecido: {manifest.get('format')!r}")
+    if manifest.get("format_version") != BUNDLE_VERSION:
+        raise BundleError(
+            f"Versão do pacote {manifest.get('format_version')} incompatível (esperada {BUNDLE_VERSION})"
+        )
+    if manifest.get("feature_order") != list(FEATURES_MODELO):
+        raise BundleError("Ordem das features do pacote diverge de config.FEATURES_MODELO")
+    faltantes = set(ARRAYS_BUNDLE) - set(manifest.get("arrays", {}))
+    if faltantes:
+        raise BundleError(f"Arrays ausentes no manifesto: {', '.join(sorted(faltantes))}")
+    return manifest
+
+
+def load_arrays(bundle_dir, manifest: dict, verify: bool = True) -> dict:
+    """Abre os arrays com `mmap_mode='r'`, conferindo checksum, dtype e shape."""
+    bundle_dir = Path(bundle_dir)
+    arrays = {}
+    for nome, info in manifest["arrays"].items():
+        caminho = bundle_dir / info["file"]
+        if not caminho.is_file():
+            raise BundleError(f"Arquivo do pacote ausente: {info['file']}")
+        if verify and _sha256(caminho) != info["sha256"]:
+            raise BundleError(f"Checksum inválido para {info['file']}")
+        array = np.load(caminho, mmap_mode="r", allow_pickle=False)
+        if array.dtype.str != info["dtype"] or list(array.shape) != info["shape"]:
+            raise BundleError(f"Dtype/shape de {info['file']} não conferem com o manifesto")
+        arrays[nome] = array
+    return arrays
+
+
+def _check_consistency(arrays: dict):
+    n_features = len(FEATURES_MODELO)
+    n_nos = arrays["forest_feature"].shape[0]
+    for nome in ("forest_children_left", "forest_children_right", "forest_threshold"):
+        if arrays[nome].shape[0] != n_nos:
+            raise BundleError(f"{nome} não tem o mesmo número de nós da floresta")
+    if arrays["forest_value"].shape != (n_nos, len(arrays["forest_classes"])):
+        raise BundleError("forest_value incompatível com o número de classes")
+    if int(arrays["forest_feature"].max()) >= n_features:
+        raise BundleError("Floresta referencia features inexistentes")
+    if arrays["scaler_scale"].shape != (n_features,) or arrays["scaler_min"].shape != (n_features,):
+        raise BundleError("Parâmetros do scaler incompatíveis com as features")
+    offsets = arrays["tfidf_vocab_offsets"]
+    if offsets.shape != (arrays["tfidf_idf"].shape[0] + 1,):
+        raise BundleError("IDF e vocabulário do TF-IDF têm tamanhos diferentes")
+    if offsets[0] != 0 or offsets[-1] != arrays["tfidf_vocab_bytes"].shape[0] or np.any(np.diff(offsets) <= 0):
+        raise BundleError("Offsets do vocabulário TF-IDF inválidos")
+    if arrays["tfidf_hash_sorted"].shape != arrays["tfidf_idf"].shape or \
+            arrays["tfidf_hash_cols"].shape != arrays["tfidf_idf"].shape:
+        raise BundleError("Índice de hashes do vocabulário TF-IDF incompatível")
+
+
+def _build_vectorizer(params: dict, vocabulary, idf):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    params = dict(params)
+    params["dtype"] = np.dtype(params["dtype"]).type
+    params["ngram_range"] = tuple(params["ngram_range"])
+    vectorizer = TfidfVectorizer(
+        vocabulary={termo: i for i, termo in enumerate(vocabulary)},
+        **params
+    )
+    vectorizer.idf_ = idf
+    return vectorizer
+
+
+def load_bundle(bundle_dir, verify: bool = True):
+    """Carrega (modelo, scaler, vectorizer) do pacote, rejeitando pacotes inválidos."""
+    manifest = read_manifest(bundle_dir)
+    arrays = load_arrays(bundle_dir, manifest, verify=verify)
+    _check_consistency(arrays)
+
+    model = BundledForest(
+        arrays["forest_roots"],
+        arrays["forest_children_left"],
+        arrays["forest_children_right"],
+        arrays["forest_feature"],
+        arrays["forest_threshold"],
+        arrays["forest_value"],
+        arrays["forest_classes"],
+    )
+    scaler = BundledScaler(
+        arrays["scaler_scale"],
+        arrays["scaler_min"],
+        manifest["scaler"]["feature_range"],
+        manifest["scaler"]["clip"],
+    )
+    params = manifest["vectorizer"]["params"]
+    if parametros_suportados(params):
+        # Caminho compacto: nenhum dicionário de vocabulário é criado no processo
+        vectorizer = CompactTfidfVectorizer(
+            arrays["tfidf_vocab_bytes"],
+            arrays["tfidf_vocab_offsets"],
+            arrays["tfidf_hash_sorted"],
+            arrays["tfidf_hash_cols"],
+            arrays["tfidf_idf"],
+            params,
+        )
+    else:
+        vectorizer = _build_vectorizer(
+            params,
+            decode_vocabulary(arrays["tfidf_vocab_bytes"], arrays["tfidf_vocab_offsets"]),
+            arrays["tfidf_idf"],
+        )
+    # Identifica o vocabulário/IDF carregado, para caches derivados do vectorizer,
+    # e o pacote inteiro, para resultados que dependem também da floresta e do scaler
+    vectorizer.bundle_id = identidade_tfidf(manifest)
+    model.bundle_id = identidade_pacote(manifest)
+    return model, scaler, vectorizer
+
+
+def identidade_tfidf(manifest: dict) -> str:
+    """Hash dos checksums dos arrays TF-IDF e dos parâmetros do vectorizer."""
+    partes = {
+        nome: info["sha256"] for nome, info in manifest["arrays"].items() if nome.startswith("tfidf_")
+    }
+    partes["params"] = manifest["vectorizer"]["params"]
+    return hashlib.sha256(json.dumps(partes, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def identidade_pacote(manifest: dict) -> str:
+    """Hash dos checksums de todos os arrays, da ordem das features e dos parâmetros do pacote."""
+    partes = {nome: info["sha256"] for nome, info in manifest["arrays"].items()}
+    partes["feature_order"] = manifest["feature_order"]
+    partes["scaler"] = manifest["scaler"]
+    partes["params"] = manifest["vectorizer"]["params"]
+    return hashlib.sha256(json.dumps(partes, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def vetorizacao_identica(compacto, original, n_docs: int = 500, seed: int = 0) -> bool:
+    """Confere se o vectorizer do pacote gera exatamente as matrizes do original.
+
+    Os documentos de teste misturam termos do vocabulário, palavras desconhecidas,
+    maiúsculas, pontuação e documentos vazios.
+    """
+    rng = np.random.default_rng(seed)
+    termos = original.get_feature_names_out()
+    extras = ["XYZdesconhecido", "a", "Python!", "dados,", "ÇÃO", "  ", "3d", "_x_"]
+    documentos = [""]
+    for _ in range(n_docs):
+        palavras = list(rng.choice(termos, size=rng.integers(0, 60)))
+        palavras += list(rng.choice(extras, size=rng.integers(0, 5)))
+        rng.shuffle(palavras)
+        documentos.append(" ".join(p.upper() if rng.random() < 0.1 else p for p in palavras))
+    esperado = original.transform(documentos)
+    obtido = compacto.transform(documentos)
+    return (
+        esperado.shape == obtido.shape
+        and esperado.dtype == obtido.dtype
+        and np.array_equal(esperado.indptr, obtido.indptr)
+        and np.array_equal(esperado.indices, obtido.indices)
+        and np.array_equal(esperado.data, obtido.data)
+    )
+
+
+def main():
+    """Converte os arquivos .pkl do notebook no pacote versionado."""
+    import joblib
+
+    parser = argparse.ArgumentParser(description="Gera o pacote de artefatos do modelo")
+    parser.add_argument("--modelo", default="modelo_rf_final.pkl")
+    parser.add_argument("--scaler", default="scaler_final.pkl")
+    parser.add_argument("--vectorizer", default="tfidf_vectorizer.pkl")
+    parser.add_argument("--saida", default=None)
+    args = parser.parse_args()
+
+    base_dir = Path(__file__).resolve().parent.parent
+    destino = Path(args.saida) if args.saida else base_dir / MODEL_BUNDLE_DIR
+    model = joblib.load(args.modelo)
+    scaler = joblib.load(args.scaler)
+    vectorizer = joblib.load(args.vectorizer)
+    # O pacote só é publicado depois de conferido contra os objetos originais
+    build_bundle(model, scaler, vectorizer, destino)
+    print(f"Pacote gerado em {destino}")
+
+
+if __name__ == "__main__":
+    main()
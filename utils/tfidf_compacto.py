@@ -0,0 +1,157 @@
+import hashlib
+import re
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+
+def hash_termo(termo_utf8: bytes) -> int:
+    """Hash de 64 bits estável entre processos (o `hash()` do Python é aleatorizado)."""
+    return int.from_bytes(hashlib.blake2b(termo_utf8, digest_size=8).digest(), "little")
+
+
+def encode_vocabulary(termos) -> tuple:
+    """Codifica os termos como um único buffer UTF-8 e offsets (evita strings de largura fixa)."""
+    codificados = [termo.encode("utf-8") for termo in termos]
+    offsets = np.zeros(len(codificados) + 1, dtype=np.int64)
+    np.cumsum([len(c) for c in codificados], out=offsets[1:])
+    return np.frombuffer(b"".join(codificados), dtype=np.uint8), offsets
+
+
+def decode_vocabulary(vocab_bytes, offsets) -> list:
+    """Reconstrói a lista de termos (na ordem das colunas) a partir do buffer UTF-8."""
+    dados = bytes(vocab_bytes)
+    return [dados[i:j].decode("utf-8") for i, j in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def build_hash_index(vocab_bytes, offsets) -> tuple[np.ndarray, np.ndarray]:
+    """Índice do vocabulário: hashes ordenados e a coluna TF-IDF de cada um."""
+    dados = bytes(vocab_bytes)
+    hashes = np.fromiter(
+        (hash_termo(dados[i:j]) for i, j in zip(offsets[:-1].tolist(), offsets[1:].tolist())),
+        dtype=np.uint64,
+        count=len(offsets) - 1
+    )
+    ordem = np.argsort(hashes, kind="stable")
+    return hashes[ordem], ordem.astype(np.int64)
+
+
+def parametros_suportados(params: dict) -> bool:
+    """Indica se a configuração do TfidfVectorizer é reproduzida pelo caminho compacto."""
+    return (
+        params["analyzer"] == "word"
+        and tuple(params["ngram_range"]) == (1, 1)
+        and params["stop_words"] is None
+        and params["strip_accents"] is None
+        and params["input"] == "content"
+        and params["norm"] in ("l1", "l2", None)
+    )
+
+
+class CompactTfidfVectorizer:
+    """TF-IDF sobre o vocabulário compacto do pacote, sem o dicionário `vocabulary_`.
+
+    Os termos ficam num buffer UTF-8 com offsets e são localizados por um índice de
+    hashes ordenados (busca binária + conferência dos bytes), todos arrays que podem
+    ser mapeados em memória. As matrizes produzidas são idênticas às do
+    TfidfVectorizer original.
+    """
+
+    def __init__(self, vocab_bytes, offsets, hash_sorted, hash_cols, idf, params: dict):
+        self.vocab_bytes = vocab_bytes
+        self.offsets = offsets
+        self.hash_sorted = hash_sorted
+        self.hash_cols = hash_cols
+        self.idf_ = idf
+        self.params = params
+        self.n_features = idf.shape[0]
+        self.dtype = np.dtype(params["dtype"])
+        self._token_pattern = re.compile(params["token_pattern"])
+
+    def get_feature_names_out(self) -> np.ndarray:
+        return np.asarray(decode_vocabulary(self.vocab_bytes, self.offsets), dtype=object)
+
+    def _localizar(self, termos: list) -> np.ndarray:
+        """Coluna de cada termo (-1 quando fora do vocabulário)."""
+        codificados = [t.encode("utf-8") for t in termos]
+        hashes = np.fromiter((hash_termo(c) for c in codificados), dtype=np.uint64, count=len(codificados))
+        posicoes = np.searchsorted(self.hash_sorted, hashes)
+        colunas = np.full(len(codificados), -1, dtype=np.int64)
+        n = self.hash_sorted.shape[0]
+        for k in np.flatnonzero(posicoes < n):
+            pos = posicoes[k]
+            # Percorre os termos com o mesmo hash para descartar colisões
+            while pos < n and self.hash_sorted[pos] == hashes[k]:
+                col = self.hash_cols[pos]
+                inicio, fim = self.offsets[col], self.offsets[col + 1]
+                if self.vocab_bytes[inicio:fim].tobytes() == codificados[k]:
+                    colunas[k] = col
+                    break
+                pos += 1
+        return colunas
+
+    def transform_tokens(self, documentos_tokens) -> sp.csr_matrix:
+        """Converte listas de tokens já normalizados em linhas TF-IDF."""
+        tokens, tamanhos = [], []
+        for doc in documentos_tokens:
+            n_antes = len(tokens)
+            tokens.extend(doc)
+            tamanhos.append(len(tokens) - n_antes)
+        n_docs = len(tamanhos)
+
+        if tokens:
+            # Cada termo distinto do lote é localizado uma única vez
+            inversos, unicos = pd.factorize(np.asarray(tokens, dtype=object))
+            colunas = self._localizar(unicos.tolist())[inversos]
+            docs = np.repeat(np.arange(n_docs, dtype=np.int64), tamanhos)
+            conhecidos = colunas >= 0
+            chaves = docs[conhecidos] * self.n_features + colunas[conhecidos]
+            chaves, contagens = np.unique(chaves, return_counts=True)
+        else:
+            chaves = np.empty(0, dtype=np.int64)
+            contagens = np.empty(0, dtype=np.int64)
+
+        linhas, indices = np.divmod(chaves, self.n_features)
+        indptr = np.zeros(n_docs + 1, dtype=np.int64)
+        np.cumsum(np.bincount(linhas, minlength=n_docs), out=indptr[1:])
+        X = sp.csr_matrix((contagens.astype(self.dtype), indices, indptr), shape=(n_docs, self.n_features))
+        return self._aplicar_tfidf(X)
+
+    def _aplicar_tfidf(self, X: sp.csr_matrix) -> sp.csr_matrix:
+        # Mesma sequência de operações do TfidfTransformer do scikit-learn
+        if self.params["binary"]:
+            X.data.fill(1)
+        if self.params["sublinear_tf"]:
+            np.log(X.data, X.data)
+            X.data += 1.0
+        if self.params["use_idf"]:
+            X.data *= self.idf_[X.indices]
+        if self.params["norm"] is not None:
+            X = normalize(X, norm=self.params["norm"], copy=False)
+        return X
+
+    def tokenizar(self, documento: str) -> list:
+        """Tokenização equivalente à do TfidfVectorizer (`lowercase` + `token_pattern`)."""
+        if self.params["lowercase"]:
+            documento = documento.lower()
+        return self._token_pattern.findall(documento)
+
+    def transform(self, raw_documents) -> sp.csr_matrix:
+        """Interface compatível com `TfidfVectorizer.transform` para textos brutos."""
+        if isinstance(raw_documents, str):
+            raise ValueError("Iterable over raw text documents expected, string object received.")
+        return self.transform_tokens(self.tokenizar(doc) for doc in raw_documents)
+
+
+def vetorizar_preprocessados(vectorizer, textos: list) -> sp.csr_matrix:
+    """TF-IDF de textos já passados por `preprocessar_texto`.
+
+    Esses textos só têm palavras minúsculas de 3+ caracteres `\\w` separadas por
+    espaço, então os tokens do `token_pattern` padrão são exatamente os do `split()`.
+    """
+    if isinstance(vectorizer, CompactTfidfVectorizer) and \
+            vectorizer.params["token_pattern"] == r"(?u)\b\w\w+\b":
+        return vectorizer.transform_tokens(texto.split() for texto in textos)
+    return vectorizer.transform(textos)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import streamlit as st
+
+from config import MAPA_ACADEMICO, MAPA_IDIOMA, MAPA_NIVEL_PROFISSIONAL
+from utils.text_processing import extrair_competencias, preprocessar_texto
+from utils.tfidf_compacto import vetorizar_preprocessados
+
+
+@dataclass(frozen=True)
+class VagaCompilada:
+    """Artefatos derivados de uma vaga, reaproveitados entre submissões e sessões."""
+    chave: str
+    termos: frozenset
+    matcher: Optional[re.Pattern]
+    prefixos: dict
+    req_preprocessado: str
+    req_vetor: object
+    req_norma: float
+    nivel_academico: float
+    nivel_ingles: int
+    nivel_espanhol: int
+    nivel_profissional: float
+
+    def encontrar_termos(self, texto_lower: str) -> set:
+        """Competências da vaga presentes no texto (equivalente a `termo in texto_lower`)."""
+        if self.matcher is None:
+            return set()
+        # O matcher devolve o termo mais longo em cada posição; os termos que são
+        # prefixo dele também ocorrem ali e são adicionados via `prefixos`
+        encontrados = set()
+        for m in self.matcher.finditer(texto_lower):
+            encontrados.update(self.prefixos[m.group(1)])
+        return encontrados
+
+
+def identidade_vectorizer(vectorizer) -> str:
+    """Identifica o vocabulário do vectorizer (do pacote quando disponível)."""
+    bundle_id = getattr(vectorizer, "bundle_id", None)
+    return bundle_id if bundle_id is not None else f"id:{id(vectorizer)}"
+
+
+def chave_vaga(job_requirements, job_academic_level, job_english, job_spanish, job_professional_level,
+               vectorizer) -> str:
+    """Hash da especificação normalizada da vaga e do vectorizer que gera o vetor dos requisitos."""
+    spec = {
+        "vectorizer": identidade_vectorizer(vectorizer),
+        "termos": sorted(extrair_competencias(job_requirements)),
+        "academico": job_academic_level.lower(),
+        "ingles": job_english.lower(),
+        "espanhol": job_spanish.lower(),
+        "profissional": job_professional_level.lower(),
+    }
+    return hashlib.sha256(json.dumps(spec, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _compilar_matcher(termos: frozenset):
+    if not termos:
+        return None, {}
+    ordenados = sorted(termos, key=lambda t: (-len(t), t))
+    matcher = re.compile("(?=(" + "|".join(re.escape(t) for t in ordenados) + "))")
+    prefixos = {u: tuple(t for t in termos if u.startswith(t)) for u in termos}
+    return matcher, prefixos
+
+
+def compilar_vaga(chave, job_requirements, job_academic_level, job_english, job_spanish,
+                  job_professional_level, vectorizer, stopwords: set) -> VagaCompilada:
+    """Constrói todos os artefatos da vaga, incluindo o vetor TF-IDF dos requisitos."""
+    termos = frozenset(extrair_competencias(job_requirements))
+    matcher, prefixos = _compilar_matcher(termos)
+    req_preprocessado = preprocessar_texto(" ".join(termos), stopwords)
+    req_vetor = vetorizar_preprocessados(vectorizer, [req_preprocessado])
+    return VagaCompilada(
+        chave=chave,
+        termos=termos,
+        matcher=matcher,
+        prefixos=prefixos,
+        req_preprocessado=req_preprocessado,
+        req_vetor=req_vetor,
+        req_norma=float(np.sqrt(req_vetor.multiply(req_vetor).sum())),
+        nivel_academico=MAPA_ACADEMICO[job_academic_level.lower()],
+        nivel_ingles=MAPA_IDIOMA[job_english.lower()],
+        nivel_espanhol=MAPA_IDIOMA[job_spanish.lower()],
+        nivel_profissional=MAPA_NIVEL_PROFISSIONAL[job_professional_level.lower()],
+    )
+
+
+class VagaCache:
+    """Cache LRU de vagas compiladas, seguro para uso concorrente entre sessões."""
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obter(self, job_requirements, job_academic_level, job_english, job_spanish,
+              job_professional_level, vectorizer, stopwords: set) -> VagaCompilada:
+        """Retorna a vaga compilada do cache, compilando-a apenas na primeira vez."""
+        chave = chave_vaga(job_requirements, job_academic_level, job_english, job_spanish, job_professional_level,
+                           vectorizer)
+        with self._lock:
+            vaga = self._itens.get(chave)
+            if vaga is not None:
+                self._itens.move_to_end(chave)
+                self.hits += 1
+                return vaga
+            self.misses += 1
+
+        vaga = compilar_vaga(chave, job_requirements, job_academic_level, job_english, job_spanish,
+                             job_professional_level, vectorizer, stopwords)
+        with self._lock:
+            self._itens[chave] = vaga
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.maxsize:
+                self._itens.popitem(last=False)
+        return vaga
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "tamanho": len(self._itens), "maxsize": self.maxsize}
+
+    def limpar(self):
+        with self._lock:
+            self._itens.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+@st.cache_resource
+def get_vaga_cache() -> VagaCache:
+    """Instância única do cache por processo, compartilhada por todas as sessões."""
+    return VagaCache()
+
+
+def calcular_similaridade_vaga(vaga: VagaCompilada, cv_preprocessado: str, vectorizer) -> float:
+    """Similaridade de cosseno entre o CV e o vetor de requisitos já calculado da vaga."""
+    if vaga.req_norma == 0:
+        return 0.0
+    cv_vetor = vetorizar_preprocessados(vectorizer, [cv_preprocessado])
+    if cv_vetor.shape != vaga.req_vetor.shape:
+        raise ValueError(
+            f"Vetor da vaga com {vaga.req_vetor.shape[1]} termos e do CV com {cv_vetor.shape[1]}: "
+            "a vaga foi compilada com outro vectorizer"
+        )
+    cv_norma = np.sqrt(cv_vetor.multiply(cv_vetor).sum())
+    if cv_norma == 0:
+        return 0.0
+    return float(cv_vetor.multiply(vaga.req_vetor).sum() / (vaga.req_norma * cv_norma))